@@ -1,152 +1,242 @@
 import os
 import re
 import requests
-import random
-import string
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import mmap
+import queue
+import secrets
+import shutil
+import socket
+import sys
 import time
-from pathlib import Path
+import threading
+from urllib.parse import quote, unquote
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Configuration
 GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')
 REPO_NAME = os.environ.get('REPO_NAME')  # format: username/repo
 DRIVE_FILE = 'drive.txt'
+TEMP_FOLDER = 'temp_videos'
+UPLOAD_CONCURRENCY = int(os.environ.get('UPLOAD_CONCURRENCY', '4'))  # parallel videos
+MB = 1 << 20
+STREAM_CHUNK_SIZE = MB  # 1MB chunks piped from Drive to GitHub
+DOWNLOAD_CHUNK_SIZE = 4 * MB  # 4MB reads when spooling to disk
+UPLOAD_ATTEMPTS = 5
+UPLOAD_RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+# Progress is printed as whole [idx] lines every PROGRESS_INTERVAL seconds per video,
+# since workers share stdout and Actions logs ignore \r
+PROGRESS_INTERVAL = 5.0
 
-def generate_random_suffix(length=6):
-    """Generate random suffix for uniqueness"""
-    return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
+class UploadAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets disable Nagle and send TCP keepalives, for long uploads"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = [
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+def create_adapter(adapter_class=HTTPAdapter):
+    """Create a pooled adapter that retries gateway errors"""
+    return adapter_class(
+        pool_connections=16,
+        pool_maxsize=max(32, UPLOAD_CONCURRENCY * 2),  # every worker can hold a transfer and an API call
+        max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    )
+
+def create_session():
+    """Create a pooled keep-alive session that retries gateway errors"""
+    session = requests.Session()
+    session.mount("https://", create_adapter())
+    return session
+
+# Shared sessions so API calls reuse connections instead of a new TLS handshake each time
+GH_SESSION = create_session()
+GH_SESSION.headers.update({
+    "Authorization": f"token {GITHUB_TOKEN}",
+    "Accept": "application/vnd.github.v3+json"
+})
+GH_SESSION.mount("https://uploads.github.com", create_adapter(UploadAdapter))
+GDRIVE_SESSION = create_session()
+TAGS_LOCK = threading.Lock()  # guards the shared set of release tags
+
+# Compiled once at import; the three Drive URL forms are matched in one scan
+DRIVE_ID_RE = re.compile(r'(?:/file/d/|id=|/d/)([a-zA-Z0-9_-]+)')
+UNSAFE_NAME_RE = re.compile(r'[^a-zA-Z0-9_-]')
+CONFIRM_RE = re.compile(rb'confirm=([^&"]+)')
+FILENAME_STAR_RE = re.compile(r"filename\*\s*=\s*[\w!#$%&+^`{}~-]*'[\w-]*'([^;\s]+)", re.IGNORECASE)  # RFC 5987
+FILENAME_RE = re.compile(r'filename\s*=\s*"?([^";]+)"?', re.IGNORECASE)
+EXTENSION_RE = re.compile(r'\.(?=[0-9]*[a-zA-Z])[a-zA-Z0-9]{1,5}')  # .mp4, .mkv, .3gp, not .01
 
 def extract_drive_file_id(url):
     """Extract file ID from Google Drive URL"""
-    patterns = [
-        r'/file/d/([a-zA-Z0-9_-]+)',
-        r'id=([a-zA-Z0-9_-]+)',
-        r'/d/([a-zA-Z0-9_-]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+    match = DRIVE_ID_RE.search(url)
+    return match.group(1) if match else None
 
-def get_drive_file_info(file_id):
-    """Get file information from Google Drive"""
-    try:
-        # Try to get file metadata
-        api_url = f"https://www.googleapis.com/drive/v3/files/{file_id}?fields=name,size"
-        response = requests.get(api_url)
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data.get('name', f'video_{file_id[:8]}.mp4')
-        else:
-            return f'video_{file_id[:8]}.mp4'
-    except:
-        return f'video_{file_id[:8]}.mp4'
+def drive_file_name(response, file_id):
+    """Get the original filename from a Drive download's Content-Disposition header"""
+    disposition = response.headers.get('Content-Disposition', '')
+    # RFC 6266: prefer filename* when Drive sends both forms
+    match = FILENAME_STAR_RE.search(disposition) or FILENAME_RE.search(disposition)
+    if match:
+        return unquote(match.group(1))
+    return f'video_{file_id[:8]}.mp4'
 
-def download_large_file_from_drive(file_id, output_path):
-    """Download large files from Google Drive (supports 100MB+)"""
-    print(f"Downloading file ID: {file_id}")
+def open_drive_stream(file_id, idx):
+    """Open a streaming download for a Google Drive file (supports 100MB+)"""
+    print(f"[{idx}] Downloading file ID: {file_id}")
     
-    # Use direct download with session to handle large files
+    # Use direct download with the shared Drive session to handle large files
     url = "https://drive.google.com/uc?export=download"
     
-    session = requests.Session()
+    session = GDRIVE_SESSION
+    # No compression, so Content-Length is the size of the bytes we pass on to GitHub
+    headers = {'Accept-Encoding': 'identity'}
     
     try:
         # First request
-        response = session.get(url, params={'id': file_id}, stream=True)
-        
-        # Handle virus scan warning for large files
-        token = None
-        for key, value in response.cookies.items():
-            if key.startswith('download_warning'):
-                token = value
-                break
-        
-        if token:
-            params = {'id': file_id, 'confirm': token}
-            response = session.get(url, params=params, stream=True)
+        response = session.get(url, params={'id': file_id}, headers=headers, stream=True)
         
-        # Check for Google Drive confirmation page
+        # Large files get a virus scan warning page instead of the file itself;
+        # anything else is already the file stream and must not be read here
         if 'text/html' in response.headers.get('Content-Type', ''):
-            # Extract confirmation token from HTML
-            for line in response.iter_lines():
-                if b'download' in line and b'confirm' in line:
-                    match = re.search(b'confirm=([^&"]+)', line)
-                    if match:
-                        confirm_token = match.group(1).decode()
-                        params = {'id': file_id, 'confirm': confirm_token}
-                        response = session.get(url, params=params, stream=True)
+            # The warning page is small, so it is safe to read whole
+            match = CONFIRM_RE.search(response.content)
+            if match:
+                token = match.group(1).decode()
+            else:
+                token = None
+                for key, value in response.cookies.items():
+                    if key.startswith('download_warning'):
+                        token = value
                         break
+            
+            if token:
+                response.close()
+                params = {'id': file_id, 'confirm': token}
+                response = session.get(url, params=params, headers=headers, stream=True)
         
-        # Download file
+        # Still a web page (quota exceeded, unknown warning form), not the video
+        if 'text/html' in response.headers.get('Content-Type', ''):
+            print(f"[{idx}] ✗ Drive returned a web page instead of the file")
+            response.close()
+            return None
+        
+        return response
+        
+    except Exception as e:
+        print(f"[{idx}] ✗ Error downloading: {e}")
+        return None
+
+def report_progress(f, idx, done):
+    """Print how much has been written to f every PROGRESS_INTERVAL until done is set"""
+    # Only downloads without a Content-Length are spooled, so there is no total to show
+    write = sys.stdout.write
+    while not done.wait(PROGRESS_INTERVAL):
+        write(f"[{idx}] Downloaded: {f.tell()/MB:.1f} MB\n")
+        sys.stdout.flush()
+
+class BackgroundWriter:
+    """File-like writer that hands chunks to a thread, so disk writes overlap the next network read"""
+    
+    def __init__(self, f, depth=4):
+        self.f = f
+        self.chunks = queue.Queue(maxsize=depth)  # bounds buffered data to depth chunks
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def _run(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                return
+            # After a failure keep draining so write() and close() never block on a full queue
+            if self.error is None:
+                try:
+                    self.f.write(chunk)
+                except BaseException as e:
+                    self.error = e
+    
+    def write(self, chunk):
+        if self.error is not None:
+            raise self.error
+        self.chunks.put(chunk)
+        return len(chunk)
+    
+    def close(self):
+        self.chunks.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+def download_large_file_from_drive(response, output_path, idx):
+    """Save an open Drive download stream to disk"""
+    try:
         total_size = int(response.headers.get('content-length', 0))
         
-        print(f"File size: {total_size / (1024*1024):.2f} MB")
+        if total_size > 0:
+            print(f"[{idx}] File size: {total_size / MB:.2f} MB")
         
         with open(output_path, 'wb') as f:
-            downloaded = 0
-            chunk_size = 32768  # 32KB chunks for better speed
+            # Progress runs on its own thread so the copy loop stays tight
+            done = threading.Event()
+            reporter = threading.Thread(target=report_progress, args=(f, idx, done), daemon=True)
+            reporter.start()
             
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    
-                    if total_size > 0:
-                        progress = (downloaded / total_size) * 100
-                        print(f"\rDownload progress: {progress:.1f}% ({downloaded/(1024*1024):.1f}/{total_size/(1024*1024):.1f} MB)", end='')
+            try:
+                response.raw.decode_content = True
+                writer = BackgroundWriter(f)
+                try:
+                    shutil.copyfileobj(response.raw, writer, length=DOWNLOAD_CHUNK_SIZE)
+                finally:
+                    writer.close()
+            finally:
+                done.set()
+                reporter.join()
         
-        print(f"\n✓ Download completed: {output_path}")
+        print(f"[{idx}] ✓ Download completed: {output_path}")
         return True
         
     except Exception as e:
-        print(f"✗ Error downloading: {e}")
+        print(f"[{idx}] ✗ Error downloading: {e}")
         return False
 
-def get_all_releases(repo_name, token):
-    """Get all existing releases"""
-    url = f"https://api.github.com/repos/{repo_name}/releases"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+def get_all_releases(repo_name):
+    """Get all existing releases, following every page"""
+    url = f"https://api.github.com/repos/{repo_name}/releases?per_page=100"
+    releases = []
     
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            return response.json()
-        return []
-    except:
-        return []
+        while url:
+            response = GH_SESSION.get(url)
+            if response.status_code != 200:
+                break
+            releases.extend(response.json())
+            url = response.links.get('next', {}).get('url')
+        return releases
+    except requests.RequestException:
+        return releases
 
-def create_unique_release(repo_name, base_name, token):
-    """Create release with unique name"""
-    existing_releases = get_all_releases(repo_name, token)
-    existing_tags = [r['tag_name'] for r in existing_releases]
-    
-    # Generate unique tag
-    tag_name = base_name
-    counter = 1
-    
-    while tag_name in existing_tags:
-        suffix = generate_random_suffix()
-        tag_name = f"{base_name}-{suffix}"
-        counter += 1
+def create_unique_release(repo_name, base_name, existing_tags, idx):
+    """Create release with unique name, existing_tags is updated with the new tag"""
+    # Pick and reserve the tag under the lock so parallel workers can't choose the same one
+    with TAGS_LOCK:
+        tag_name = base_name
         
-        if counter > 10:  # Safety check
-            tag_name = f"{base_name}-{int(time.time())}"
-            break
+        if tag_name in existing_tags:
+            # 32 random bits, unique on the first try
+            tag_name = f"{base_name}-{secrets.token_hex(4)}"
+            assert tag_name not in existing_tags
+        
+        existing_tags.add(tag_name)
     
     url = f"https://api.github.com/repos/{repo_name}/releases"
     
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-    
     data = {
         "tag_name": tag_name,
         "name": tag_name,
@@ -155,48 +245,264 @@ def create_unique_release(repo_name, base_name, token):
         "prerelease": False
     }
     
-    response = requests.post(url, json=data, headers=headers)
+    try:
+        response = GH_SESSION.post(url, json=data)
+    except requests.RequestException as e:
+        print(f"[{idx}] ✗ Error creating release: {e}")
+        response = None
     
-    if response.status_code == 201:
-        print(f"✓ Created release: {tag_name}")
+    if response is not None and response.status_code == 201:
+        print(f"[{idx}] ✓ Created release: {tag_name}")
         return response.json()
+    
+    if response is not None:
+        print(f"[{idx}] ✗ Error creating release: {response.status_code}")
+        print(f"[{idx}] {response.text}")
+    # Free the reserved tag so a later video can use it
+    with TAGS_LOCK:
+        existing_tags.discard(tag_name)
+    return None
+
+class SizedStream:
+    """Iterable upload body with a known length, so requests sends Content-Length instead of chunked encoding"""
+    
+    def __init__(self, chunks, size):
+        self.chunks = chunks
+        self.size = size
+    
+    def __len__(self):
+        return self.size
+    
+    def __iter__(self):
+        return iter(self.chunks)
+
+def handle_upload_response(response, idx):
+    """Return the asset download URL from a GitHub upload response"""
+    if response.status_code == 201:
+        asset_data = response.json()
+        download_url = asset_data['browser_download_url']
+        print(f"[{idx}] ✓ Upload successful!")
+        print(f"[{idx}] Download URL: {download_url}")
+        return download_url
     else:
-        print(f"✗ Error creating release: {response.status_code}")
-        print(response.text)
+        print(f"[{idx}] ✗ Upload failed: {response.status_code}")
+        print(f"[{idx}] {response.text}")
         return None
 
-def upload_to_release(repo_name, release_id, file_path, token):
-    """Upload file to GitHub release"""
-    file_name = os.path.basename(file_path)
-    file_size = os.path.getsize(file_path)
-    
-    print(f"Uploading: {file_name} ({file_size / (1024*1024):.2f} MB)")
+def is_stale_asset(response):
+    """True for GitHub's 422 when a failed upload left an asset with the same name behind"""
+    if response.status_code != 422:
+        return False
+    try:
+        errors = response.json().get('errors', [])
+    except ValueError:
+        return False
+    return any(error.get('code') == 'already_exists' for error in errors)
+
+def delete_release_asset(repo_name, release_id, file_name, idx):
+    """Delete a half-created asset left by a failed upload, returns False if the name may still be taken"""
+    url = f"https://api.github.com/repos/{repo_name}/releases/{release_id}/assets?per_page=100"
     
-    url = f"https://uploads.github.com/repos/{repo_name}/releases/{release_id}/assets?name={file_name}"
+    try:
+        response = GH_SESSION.get(url)
+        if response.status_code != 200:
+            print(f"[{idx}] ✗ Could not list release assets: {response.status_code}")
+            return False
+        for asset in response.json():
+            if asset['name'] == file_name:
+                response = GH_SESSION.delete(f"https://api.github.com/repos/{repo_name}/releases/assets/{asset['id']}")
+                if response.status_code != 204:
+                    print(f"[{idx}] ✗ Could not delete partial asset: {response.status_code}")
+                    return False
+                print(f"[{idx}] Deleted partial asset: {file_name}")
+                break
+        return True
+    except requests.RequestException as e:
+        print(f"[{idx}] ✗ Could not delete partial asset: {e}")
+        return False
+
+def post_upload(repo_name, release_id, file_name, open_body, idx):
+    """Upload a release asset with exponential backoff, open_body(attempt) gives each attempt's body or None to stop"""
+    url = f"https://uploads.github.com/repos/{repo_name}/releases/{release_id}/assets?name={quote(file_name, safe='')}"
     
     headers = {
-        "Authorization": f"token {token}",
         "Content-Type": "application/octet-stream"
     }
     
+    for attempt in range(1, UPLOAD_ATTEMPTS + 1):
+        body = open_body(attempt)
+        if body is None:
+            return None
+        
+        error = None
+        try:
+            response = GH_SESSION.post(url, data=body, headers=headers, timeout=600)
+            retry = response.status_code in UPLOAD_RETRY_STATUSES or is_stale_asset(response)
+            if not retry or attempt == UPLOAD_ATTEMPTS:
+                return response
+            print(f"[{idx}] ✗ Upload attempt {attempt} failed: {response.status_code}")
+        except requests.RequestException as e:
+            if attempt == UPLOAD_ATTEMPTS:
+                raise
+            print(f"[{idx}] ✗ Upload attempt {attempt} failed: {e}")
+            error = e
+        
+        # A failed upload can leave a half-created asset that blocks the name (422 already_exists);
+        # if it can't be removed, another attempt would only re-download into the same 422
+        if not delete_release_asset(repo_name, release_id, file_name, idx):
+            print(f"[{idx}] ✗ Giving up on upload")
+            if error is not None:
+                raise error
+            return response
+        
+        print(f"[{idx}] Retrying upload")
+        time.sleep(2 ** attempt)
+
+def stream_drive_to_release(response, repo_name, release_id, file_name, file_id, idx):
+    """Pipe an open Drive download straight into a GitHub release asset without a temp file"""
+    total_size = int(response.headers['content-length'])
+    
+    print(f"[{idx}] Streaming: {file_name} ({total_size / MB:.2f} MB)")
+    
+    def chunks(source):
+        streamed = 0
+        last_print = 0.0
+        total_mb = total_size / MB
+        write = sys.stdout.write
+        for chunk in source.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            if chunk:
+                streamed += len(chunk)
+                if streamed > total_size:
+                    raise requests.RequestException(f"Drive sent more than the declared {total_size} bytes")
+                
+                now = time.monotonic()
+                if now - last_print >= PROGRESS_INTERVAL or streamed == total_size:
+                    progress = (streamed / total_size) * 100
+                    write(f"[{idx}] Stream progress: {progress:.1f}% ({streamed/MB:.1f}/{total_mb:.1f} MB)\n")
+                    sys.stdout.flush()
+                    last_print = now
+                yield chunk
+        
+        # A short body would otherwise leave GitHub with a truncated asset
+        if streamed != total_size:
+            raise requests.RequestException(f"Drive sent {streamed} of {total_size} bytes")
+    
+    current = response
+    
+    def open_body(attempt):
+        nonlocal current
+        if attempt > 1:
+            # The failed attempt consumed the Drive stream, so start the download again
+            current.close()
+            current = open_drive_stream(file_id, idx)
+            if current is None:
+                return None
+            if int(current.headers.get('content-length', 0)) != total_size:
+                print(f"[{idx}] ✗ Drive file size changed between attempts")
+                return None
+        return SizedStream(chunks(current), total_size)
+    
+    try:
+        upload = post_upload(repo_name, release_id, file_name, open_body, idx)
+        if upload is None:
+            return None
+        return handle_upload_response(upload, idx)
+        
+    except Exception as e:
+        print(f"[{idx}] ✗ Error streaming: {e}")
+        return None
+    finally:
+        if current is not None:
+            current.close()
+
+def upload_to_release(repo_name, release_id, file_path, idx):
+    """Upload file to GitHub release"""
+    file_name = os.path.basename(file_path)
+    
     try:
         with open(file_path, 'rb') as f:
-            response = requests.post(url, data=f, headers=headers, timeout=600)
+            # Size from the open handle, so it matches exactly what gets sent
+            file_size = os.fstat(f.fileno()).st_size
+            print(f"[{idx}] Uploading: {file_name} ({file_size / MB:.2f} MB)")
+            
+            if file_size == 0:
+                # mmap can't map an empty file
+                response = post_upload(repo_name, release_id, file_name, lambda attempt: b'', idx)
+            else:
+                # A memoryview has no read(), so the mapping goes to the socket
+                # in one sendall instead of being copied out block by block.
+                # Every retry re-sends the same mapping, nothing is buffered again.
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as body:
+                    response = post_upload(repo_name, release_id, file_name, lambda attempt: body, idx)
         
-        if response.status_code == 201:
-            asset_data = response.json()
-            download_url = asset_data['browser_download_url']
-            print(f"✓ Upload successful!")
-            print(f"Download URL: {download_url}")
-            return download_url
-        else:
-            print(f"✗ Upload failed: {response.status_code}")
-            print(response.text)
-            return None
+        return handle_upload_response(response, idx)
             
     except Exception as e:
-        print(f"✗ Error uploading: {e}")
+        print(f"[{idx}] ✗ Error uploading: {e}")
+        return None
+
+def process_one(idx, line, file_id, existing_tags):
+    """Download one Drive URL and upload it to a new release, returns the GitHub URL or None"""
+    print(f"\n[{idx}] Processing Drive URL...")
+    print(f"[{idx}] URL: {line[:60]}...")
+    
+    # Open the Drive download
+    response = open_drive_stream(file_id, idx)
+    if response is None:
+        print(f"[{idx}] ✗ Download failed - skipping this video")
         return None
+    
+    # Get original filename from the download headers
+    original_name = drive_file_name(response, file_id)
+    base_name, extension = os.path.splitext(original_name)
+    if not EXTENSION_RE.fullmatch(extension):
+        # Not a real file extension (e.g. "Talk 2024.05.01"), keep it in the name
+        base_name, extension = original_name, '.mp4'
+    
+    # Generate filename
+    safe_name = UNSAFE_NAME_RE.sub('_', base_name)[:50]
+    filename = f"{safe_name}{extension}"
+    
+    temp_path = None
+    task_folder = None
+    try:
+        # GitHub needs the asset size up front, so spool to disk only when Drive doesn't send it
+        if not response.headers.get('content-length'):
+            # One folder per line so parallel workers never share a path
+            task_folder = os.path.join(TEMP_FOLDER, str(idx))
+            os.makedirs(task_folder, exist_ok=True)
+            temp_path = os.path.join(task_folder, filename)
+            
+            if not download_large_file_from_drive(response, temp_path, idx):
+                print(f"[{idx}] ✗ Download failed - skipping this video")
+                return None
+        
+        # Create release
+        release_tag = f"video-{safe_name}"
+        release = create_unique_release(REPO_NAME, release_tag, existing_tags, idx)
+        
+        if not release:
+            print(f"[{idx}] ✗ Failed to create release")
+            return None
+        
+        # Upload to release
+        if temp_path:
+            github_url = upload_to_release(REPO_NAME, release['id'], temp_path, idx)
+        else:
+            github_url = stream_drive_to_release(response, REPO_NAME, release['id'], filename, file_id, idx)
+        
+        if github_url:
+            print(f"[{idx}] ✓ Successfully processed!")
+        else:
+            print(f"[{idx}] ✗ Upload failed - video not added")
+        
+        return github_url
+    
+    finally:
+        # Cleanup on every path, including errors
+        response.close()
+        if task_folder:
+            shutil.rmtree(task_folder, ignore_errors=True)
 
 def process_drive_file():
     """Main processing function - Only keeps GitHub links"""
@@ -212,10 +518,11 @@ def process_drive_file():
     with open(DRIVE_FILE, 'r') as f:
         lines = f.readlines()
     
-    github_links = []  # Only store GitHub links
-    temp_folder = "temp_videos"
-    os.makedirs(temp_folder, exist_ok=True)
+    results = {}  # line index -> GitHub link, keeps drive.txt order
+    todo = []  # (line index, Drive URL, file ID) still to upload
+    seen_links, seen_ids = set(), set()
     
+    # Sort lines before any network call, dropping repeated links and Drive files
     for idx, line in enumerate(lines, 1):
         line = line.strip()
         
@@ -225,8 +532,12 @@ def process_drive_file():
         
         # If already a GitHub link, keep it
         if 'github.com' in line:
+            if line in seen_links:
+                print(f"\n[{idx}/{len(lines)}] Duplicate GitHub link - skipping")
+                continue
+            seen_links.add(line)
             print(f"\n[{idx}/{len(lines)}] Already GitHub link - keeping it")
-            github_links.append(line)
+            results[idx] = line
             continue
         
         # Check if it's a Drive URL
@@ -234,61 +545,47 @@ def process_drive_file():
             print(f"\n[{idx}/{len(lines)}] Not a Drive URL - skipping")
             continue
         
-        print(f"\n[{idx}/{len(lines)}] Processing Drive URL...")
-        print(f"URL: {line[:60]}...")
-        
         # Extract file ID
         file_id = extract_drive_file_id(line)
         if not file_id:
-            print("✗ Could not extract file ID - skipping")
+            print(f"\n[{idx}/{len(lines)}] ✗ Could not extract file ID - skipping")
             continue
         
-        # Get original filename
-        original_name = get_drive_file_info(file_id)
-        base_name = Path(original_name).stem
-        extension = Path(original_name).suffix or '.mp4'
-        
-        # Generate filename
-        safe_name = re.sub(r'[^a-zA-Z0-9_-]', '_', base_name)[:50]
-        filename = f"{safe_name}{extension}"
-        temp_path = os.path.join(temp_folder, filename)
-        
-        # Download from Drive
-        if not download_large_file_from_drive(file_id, temp_path):
-            print("✗ Download failed - skipping this video")
+        if file_id in seen_ids:
+            print(f"\n[{idx}/{len(lines)}] Duplicate Drive file - skipping")
             continue
+        seen_ids.add(file_id)
+        todo.append((idx, line, file_id))
+    
+    # Fetch existing release tags once for the whole run
+    existing_tags = set(r['tag_name'] for r in get_all_releases(REPO_NAME)) if todo else set()
+    
+    # Videos are several GB each, so keep the number of parallel transfers small
+    with ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY) as executor:
+        futures = {}
+        for idx, line, file_id in todo:
+            futures[executor.submit(process_one, idx, line, file_id, existing_tags)] = idx
         
-        # Create release
-        release_tag = f"video-{safe_name}"
-        release = create_unique_release(REPO_NAME, release_tag, GITHUB_TOKEN)
-        
-        if not release:
-            print("✗ Failed to create release")
-            os.remove(temp_path)
-            continue
-        
-        # Upload to release
-        github_url = upload_to_release(REPO_NAME, release['id'], temp_path, GITHUB_TOKEN)
-        
-        if github_url:
-            # Add GitHub URL to list
-            github_links.append(github_url)
-            print(f"✓ Successfully processed!")
-        else:
-            print("✗ Upload failed - video not added")
-        
-        # Cleanup
-        try:
-            os.remove(temp_path)
-        except:
-            pass
-        
-        print("-" * 80)
+        for future in as_completed(futures):
+            idx = futures[future]
+            try:
+                github_url = future.result()
+            except Exception as e:
+                print(f"[{idx}] ✗ Error processing: {e}")
+                continue
+            
+            if github_url:
+                results[idx] = github_url
+            print("-" * 80)
     
-    # Write ONLY GitHub links to drive.txt
-    with open(DRIVE_FILE, 'w') as f:
-        for link in github_links:
-            f.write(link + '\n')
+    # Write ONLY GitHub links to drive.txt (via a temp file so a killed job never leaves it empty)
+    github_links = [results[idx] for idx in sorted(results)]
+    tmp_path = DRIVE_FILE + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write('\n'.join(github_links) + ('\n' if github_links else ''))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, DRIVE_FILE)
     
     print("\n" + "=" * 80)
     print("✓ Processing completed!")